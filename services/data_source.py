@@ -1,16 +1,14 @@
 import dlt
 import logging
-from typing import Dict, List, Any, Iterator, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Callable
 from datetime import datetime, timezone
 from .api_service import APIService
 from loki_logger import get_logger, log_business_event, log_security_event
-from .api_service import APIService
 from .hubspot_api_service import HubSpotAPIService
 
 # --- HubSpot helpers (dates & numbers) ---
-from typing import Any, Optional, Dict, List
-from datetime import datetime, timezone
-
 STANDARD_PROPERTIES: List[str] = [
     "dealname","amount","dealstage","pipeline","closedate","createdate",
     "hs_lastmodifieddate","hubspot_owner_id","dealtype","description",
@@ -18,26 +16,78 @@ STANDARD_PROPERTIES: List[str] = [
     "hs_analytics_source_data_2","archived",
 ]
 
+# dlt column hints for the default deal mapping; declaring the types up front
+# spares dlt from inferring them (and detecting ISO timestamps) value by value
+DEAL_COLUMNS: Dict[str, Dict[str, Any]] = {
+    "hubspot_deal_id": {"data_type": "text", "nullable": False},
+    "dealname": {"data_type": "text"},
+    "amount": {"data_type": "double"},
+    "dealstage": {"data_type": "text"},
+    "pipeline": {"data_type": "text"},
+    "closedate": {"data_type": "timestamp"},
+    "createdate": {"data_type": "timestamp"},
+    "hs_lastmodifieddate": {"data_type": "timestamp"},
+    "hs_object_id": {"data_type": "text"},
+    "archived": {"data_type": "bool"},
+    "_extracted_at": {"data_type": "timestamp"},
+    "_scan_id": {"data_type": "text"},
+    "_organization_id": {"data_type": "text"},
+    "_tenant_id": {"data_type": "text"},
+    "_page_number": {"data_type": "bigint"},
+    "_source_service": {"data_type": "text"},
+}
+
+_UTC = timezone.utc
+
+# Shared read-only fallback for deals returned without a properties object
+_EMPTY_PROPERTIES = MappingProxyType({})
+
+# Mid-page pause polling happens every (PAUSE_SAMPLE_MASK + 1) records extracted
+PAUSE_SAMPLE_MASK = 31
+
+# Records are handed to dlt in lists of up to this many items
+RECORD_BATCH_SIZE = 64
+
 def _to_timestamp(value: Optional[str]) -> Optional[str]:
+    # Fast path: HubSpot sends dates as 13-digit epoch-millisecond strings
+    if type(value) is str and len(value) == 13 and value.isdecimal():
+        return datetime.fromtimestamp(int(value) / 1000.0, _UTC).isoformat()
     if not value:
         return None
     try:
         if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
             ms = int(value)
-            return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc).isoformat()
+            return datetime.fromtimestamp(ms / 1000.0, tz=_UTC).isoformat()
         dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
-        return dt.astimezone(timezone.utc).isoformat()
+        return dt.astimezone(_UTC).isoformat()
     except Exception:
         return None
 
 def _to_decimal(value: Any) -> Optional[float]:
-    if value in (None, "", "null"):
+    if value is None or value == "" or value == "null":
         return None
     try:
         return float(value)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return None
 
+def _compile_projection(properties: Iterable[str]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Generate a projection function with the property list unrolled.
+
+    Equivalent to ``{p: record.get(p) for p in properties if p in record}`` plus
+    the always-kept ``id``, without walking the list for every record.
+    """
+    lines = ["def _project(r):", "    out = {}"]
+    for prop in dict.fromkeys(properties):
+        key = repr(str(prop))
+        lines.append(f"    if {key} in r: out[{key}] = r[{key}]")
+    lines.append('    out["id"] = r.get("id")')
+    lines.append("    return out")
+
+    namespace: Dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+    return namespace["_project"]
+
 def create_data_source(
     job_config: Dict[str, Any],
     auth_config: Dict[str, Any],
@@ -75,8 +125,14 @@ def create_data_source(
         },
     )
 
-    @dlt.resource(name="hubspot_deals", write_disposition="replace", primary_key="hubspot_deal_id")
-    def get_main_data() -> Iterator[Dict[str, Any]]:
+    @dlt.resource(
+        name="hubspot_deals",
+        write_disposition="replace",
+        primary_key="hubspot_deal_id",
+        # Projected records have caller-defined shapes, so only hint the default mapping
+        columns=None if filters.get("properties") else DEAL_COLUMNS,
+    )
+    def get_main_data() -> Iterator[List[Dict[str, Any]]]:
         """
         Extract main data from Hubspot_Deals API with checkpoint support
 
@@ -110,17 +166,85 @@ def create_data_source(
 
         # Configuration
         checkpoint_interval = 10
-        cancel_check_interval = 1
-        pause_check_interval = 1  # Check for pause more frequently than cancel
-        job_id = filters.get("scan_id", "unknown")
 
         # page_size = int(filters.get("pageSize", 100))  # HubSpot max 100
         # properties = filters.get("properties") or STANDARD_PROPERTIES
 
-        while page_count < 1000:  # Safety limit
-            try:
-                # Check for cancellation
-                if page_count % cancel_check_interval == 0:
+        # Filters are fixed for the whole extraction, so resolve them once
+        user_props = tuple(filters.get("properties") or ())
+        scan_id = filters.get("scan_id", "unknown")
+        org_id = filters.get("organization_id", "unknown")
+        job_id = scan_id
+
+        # Metadata fields that stay the same for the whole extraction
+        metadata_template = {
+            "_scan_id": scan_id,
+            "_organization_id": org_id,
+            "_tenant_id": org_id,
+            "_source_service": "hubspot_deals",
+        }
+
+        project = _compile_projection(user_props) if user_props else None
+
+        def _project_page(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return [project(record) for record in records]
+
+        def _map_page(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # Map and convert known fields
+            return [
+                {
+                    "hubspot_deal_id": record.get("id"),
+                    "dealname": properties.get("dealname"),
+                    "amount": _to_decimal(properties.get("amount")),
+                    "dealstage": properties.get("dealstage"),
+                    "pipeline": properties.get("pipeline"),
+                    "closedate": _to_timestamp(properties.get("closedate")),
+                    "createdate": _to_timestamp(properties.get("createdate")),
+                    "hs_lastmodifieddate": _to_timestamp(properties.get("hs_lastmodifieddate")),
+                    "hs_object_id": properties.get("hs_object_id"),
+                    # "hubspot_owner_id": properties.get("hubspot_owner_id"),
+                    # "dealtype": properties.get("dealtype"),
+                    # "description": properties.get("description"),
+                    # "hs_deal_stage_probability": _to_decimal(properties.get("hs_deal_stage_probability")),
+                    # "hs_analytics_source": properties.get("hs_analytics_source"),
+                    # "hs_analytics_source_data_1": properties.get("hs_analytics_source_data_1"),
+                    # "hs_analytics_source_data_2": properties.get("hs_analytics_source_data_2"),
+                    "archived": record.get("archived", False),
+                    # JSONB buckets
+                    # "raw_properties": properties,
+                    # "custom_properties": _extract_custom_properties(properties),
+                    # Associations not fetched here; can be added with another call if needed
+                    # "associations": item.get("associations"),
+                    # Multi-tenant & ETL metadata
+                    # "tenant_id": tenant_id,
+                    # "_tenant_id": tenant_id,
+                    # "_scan_id": scan_id,
+                    # "_extracted_at": datetime.now(timezone.utc).isoformat(),
+                    # "_page_number": page + 1,
+                }
+                for record in records
+                for properties in (record.get("properties") or _EMPTY_PROPERTIES,)
+            ]
+
+        build_page = _project_page if user_props else _map_page
+
+        # Progress at the last periodic checkpoint, used to record deltas
+        last_ckpt = {"page": page_count, "records": total_records}
+
+        # In-flight request for the next page and the cursor it was issued for
+        prefetched = None
+        prefetched_after = None
+
+        # Single background worker used to fetch the next page while the current
+        # page is being transformed and yielded (see
+        # HubSpotAPIService.iter_deal_pages for why one worker is enough)
+        prefetch_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="hubspot_deals_prefetch"
+        )
+        try:
+            while page_count < 1000:  # Safety limit
+                try:
+                    # Check for cancellation
                     if check_cancel_callback and check_cancel_callback(job_id):
                         logger.info(
                             "Extraction cancelled by user",
@@ -155,8 +279,7 @@ def create_data_source(
                                 )
                         break
 
-                # Check for pause request
-                if page_count % pause_check_interval == 0:
+                    # Check for pause request
                     if check_pause_callback and check_pause_callback(job_id):
                         logger.info(
                             "Extraction paused by user",
@@ -206,283 +329,271 @@ def create_data_source(
                         # Exit gracefully - this allows the job to be resumed later
                         break
 
-                logger.debug(
-                    "Fetching data page",
-                    extra={
-                        "operation": "data_extraction",
-                        "job_id": job_id,
-                        "page_number": page_count + 1,
-                    },
-                )
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "Fetching data page",
+                            extra={
+                                "operation": "data_extraction",
+                                "job_id": job_id,
+                                "page_number": page_count + 1,
+                            },
+                        )
 
                 
-                # TODO: Replace with appropriate Hubspot_Deals API call
-                data = api_service.get_data(
-                    access_token=access_token, limit=20, after=after,
-                )
+                    # TODO: Replace with appropriate Hubspot_Deals API call
+                    if prefetched and prefetched_after == after:
+                        data = prefetched.result()
+                    else:
+                        data = api_service.get_data(
+                            access_token=access_token, limit=20, after=after,
+                        )
+                    prefetched = None
+
+                    # Request the next page in the background while this one is processed
+                    prefetched_after = ((data.get("paging") or {}).get("next") or {}).get("after")
+                    if prefetched_after:
+                        prefetched = prefetch_executor.submit(
+                            api_service.get_data,
+                            access_token=access_token,
+                            limit=20,
+                            after=prefetched_after,
+                        )
                 
-                # HubSpot CRM v3 deals (cursor pagination via `after`)
-                '''
-                data = svc._request(
-                    "GET",
-                    "/crm/v3/objects/deals",
-                    params={
-                    "limit": page_size,
-                    "after": after,
-                    "properties": ",".join(properties),
-                    "archived": "false",
-                    },
-                )
-                '''
-                '''
-                # svc = HubSpotAPIService()
-                data = svc.get_deals(
-                    access_token=access_token,
-                    # limit=page_size,
-                    limit=20,
-                    after=after,
-                    url="/crm/v3/objects/deals")
-                '''
-
-                page_records = 0
-
-                # TODO: Update data processing based on Hubspot_Deals response structure
-                data_key = "results"  # Update based on API response
-                if data_key in data and data[data_key]:
-                    for record in data[data_key]:
-                        # Check for pause/cancel even within record processing for faster response
-                        if check_pause_callback and check_pause_callback(job_id):
-                            logger.info(
-                                "Extraction paused mid-page",
+                    # HubSpot CRM v3 deals (cursor pagination via `after`)
+                    '''
+                    data = svc._request(
+                        "GET",
+                        "/crm/v3/objects/deals",
+                        params={
+                        "limit": page_size,
+                        "after": after,
+                        "properties": ",".join(properties),
+                        "archived": "false",
+                        },
+                    )
+                    '''
+                    '''
+                    # svc = HubSpotAPIService()
+                    data = svc.get_deals(
+                        access_token=access_token,
+                        # limit=page_size,
+                        limit=20,
+                        after=after,
+                        url="/crm/v3/objects/deals")
+                    '''
+
+                    page_records = 0
+
+                    # TODO: Update data processing based on Hubspot_Deals response structure
+                    data_key = "results"  # Update based on API response
+                    if data_key in data and data[data_key]:
+                        # Extraction metadata is identical for every record in the page
+                        page_metadata = metadata_template.copy()
+                        page_metadata["_extracted_at"] = datetime.now(_UTC).isoformat()
+                        page_metadata["_page_number"] = page_count + 1
+
+                        batch: List[Dict[str, Any]] = []
+                        for filtered_record in build_page(data[data_key]):
+                            # Check for pause even within record processing for faster response,
+                            # sampled on the running total so it fires every 32 records across
+                            # pages; record 0 of a page is covered by the per-page check above
+                            if (
+                                page_records
+                                and ((total_records + page_records) & PAUSE_SAMPLE_MASK) == 0
+                                and check_pause_callback
+                                and check_pause_callback(job_id)
+                            ):
+                                # Hand over the records completed so far
+                                if batch:
+                                    yield batch
+                                logger.info(
+                                    "Extraction paused mid-page",
+                                    extra={
+                                        "operation": "data_extraction",
+                                        "job_id": job_id,
+                                        "page_number": page_count + 1,
+                                        "records_in_page": page_records,
+                                        "total_processed": total_records + page_records,
+                                    },
+                                )
+
+                                # Save mid-page pause checkpoint
+                                if checkpoint_callback:
+                                    try:
+                                        mid_page_checkpoint = {
+                                            "phase": "main_data_paused_mid_page",
+                                            "records_processed": total_records
+                                            + page_records,
+                                            "cursor": after,
+                                            "page_number": page_count,
+                                            "batch_size": 100,
+                                            "checkpoint_data": {
+                                                "pause_reason": "user_requested_mid_page",
+                                                "paused_at_page": page_count,
+                                                "records_completed_in_page": page_records,
+                                                "paused_at": datetime.now(
+                                                    timezone.utc
+                                                ).isoformat(),
+                                                "service": "hubspot_deals",
+                                            },
+                                        }
+                                        checkpoint_callback(job_id, mid_page_checkpoint)
+                                    except Exception as e:
+                                        logger.warning(
+                                            "Failed to save mid-page pause checkpoint",
+                                            extra={"job_id": job_id, "error": str(e)},
+                                        )
+                                return  # Exit the generator
+
+                            # Add extraction metadata
+                            filtered_record.update(page_metadata)
+
+                            batch.append(filtered_record)
+                            page_records += 1
+                            if len(batch) >= RECORD_BATCH_SIZE:
+                                yield batch
+                                batch = []
+
+                        if batch:
+                            yield batch
+
+                    # Update counters
+                    total_records += page_records
+                    page_count += 1
+
+                    # Save checkpoint periodically
+                    if checkpoint_callback and page_count % checkpoint_interval == 0:
+                        try:
+                            # TODO: Update pagination logic based on Hubspot_Deals API
+                            next_cursor = None
+                            if (
+                                data.get("paging")
+                                and data["paging"].get("next")
+                                and data["paging"]["next"].get("after")
+                            ):
+                                next_cursor = data["paging"]["next"]["after"]
+
+                            checkpoint_data = {
+                                "phase": "main_data",
+                                "records_processed": total_records,
+                                "cursor": next_cursor,
+                                "page_number": page_count,
+                                "batch_size": 100,
+                                "checkpoint_data": {
+                                    "d_pages": page_count - last_ckpt["page"],
+                                    "d_records": total_records - last_ckpt["records"],
+                                    "last_page_records": page_records,
+                                    "service": "hubspot_deals",
+                                },
+                            }
+
+                            checkpoint_callback(job_id, checkpoint_data)
+                            last_ckpt["page"] = page_count
+                            last_ckpt["records"] = total_records
+
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(
+                                    "Checkpoint saved",
+                                    extra={
+                                        "operation": "data_extraction",
+                                        "job_id": job_id,
+                                        "page_number": page_count,
+                                        "total_records": total_records,
+                                    },
+                                )
+
+                        except Exception as checkpoint_error:
+                            logger.warning(
+                                "Failed to save checkpoint",
                                 extra={
                                     "operation": "data_extraction",
                                     "job_id": job_id,
-                                    "page_number": page_count + 1,
-                                    "records_in_page": page_records,
-                                    "total_processed": total_records + page_records,
+                                    "error": str(checkpoint_error),
                                 },
                             )
 
-                            # Save mid-page pause checkpoint
-                            if checkpoint_callback:
-                                try:
-                                    mid_page_checkpoint = {
-                                        "phase": "main_data_paused_mid_page",
-                                        "records_processed": total_records
-                                        + page_records,
-                                        "cursor": after,
-                                        "page_number": page_count,
-                                        "batch_size": 100,
-                                        "checkpoint_data": {
-                                            "pause_reason": "user_requested_mid_page",
-                                            "paused_at_page": page_count,
-                                            "records_completed_in_page": page_records,
-                                            "paused_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "service": "hubspot_deals",
-                                        },
-                                    }
-                                    checkpoint_callback(job_id, mid_page_checkpoint)
-                                except Exception as e:
-                                    logger.warning(
-                                        "Failed to save mid-page pause checkpoint",
-                                        extra={"job_id": job_id, "error": str(e)},
-                                    )
-                            return  # Exit the generator
-
-                        # Filter properties if specified
-                        if "properties" in filters and filters["properties"]:
-                            filtered_record = {
-                                prop: record.get(prop)
-                                for prop in filters["properties"]
-                                if prop in record
-                            }
-                            filtered_record["id"] = record.get("id")  # Always keep ID
-                        else:
-                            properties = record.get("properties") or {}
-
-                            # Map and convert known fields
-                            out: Dict[str, Any] = {
-                                "hubspot_deal_id": record.get("id"),
-                                "dealname": properties.get("dealname"),
-                                "amount": _to_decimal(properties.get("amount")),
-                                "dealstage": properties.get("dealstage"),
-                                "pipeline": properties.get("pipeline"),
-                                "closedate": _to_timestamp(properties.get("closedate")),
-                                "createdate": _to_timestamp(properties.get("createdate")),
-                                "hs_lastmodifieddate": _to_timestamp(properties.get("hs_lastmodifieddate")),
-                                "hs_object_id": properties.get("hs_object_id"),
-                                # "hubspot_owner_id": properties.get("hubspot_owner_id"),
-                                # "dealtype": properties.get("dealtype"),
-                                # "description": properties.get("description"),
-                                # "hs_deal_stage_probability": _to_decimal(properties.get("hs_deal_stage_probability")),
-                                # "hs_analytics_source": properties.get("hs_analytics_source"),
-                                # "hs_analytics_source_data_1": properties.get("hs_analytics_source_data_1"),
-                                # "hs_analytics_source_data_2": properties.get("hs_analytics_source_data_2"),
-                                "archived": bool(record.get("archived", False)),
-                                # JSONB buckets
-                                # "raw_properties": properties,
-                                # "custom_properties": _extract_custom_properties(properties),
-                                # Associations not fetched here; can be added with another call if needed
-                                # "associations": item.get("associations"),
-                                # Multi-tenant & ETL metadata
-                                # "tenant_id": tenant_id,
-                                # "_tenant_id": tenant_id,
-                                # "_scan_id": scan_id,
-                                # "_extracted_at": datetime.now(timezone.utc).isoformat(),
-                                # "_page_number": page + 1,
-                            }
-                            filtered_record = out
-
-                        # Add extraction metadata
-                        filtered_record.update(
-                            {
-                                "_extracted_at": datetime.now(timezone.utc).isoformat(),
-                                "_scan_id": filters.get("scan_id", "unknown"),
-                                "_organization_id": filters.get(
-                                    "organization_id", "unknown"
-                                ),
-                                "_tenant_id": filters.get(
-                                    "organization_id", "unknown"
-                                ),
-                                "_page_number": page_count + 1,
-                                "_source_service": "hubspot_deals",
-                            }
-                        )
-
-                        yield filtered_record
-                        page_records += 1
-
-                # Update counters
-                total_records += page_records
-                page_count += 1
-
-                # Save checkpoint periodically
-                if checkpoint_callback and page_count % checkpoint_interval == 0:
-                    try:
-                        # TODO: Update pagination logic based on Hubspot_Deals API
-                        next_cursor = None
-                        if (
-                            data.get("paging")
-                            and data["paging"].get("next")
-                            and data["paging"]["next"].get("after")
-                        ):
-                            next_cursor = data["paging"]["next"]["after"]
-
-                        checkpoint_data = {
-                            "phase": "main_data",
-                            "records_processed": total_records,
-                            "cursor": next_cursor,
-                            "page_number": page_count,
-                            "batch_size": 100,
-                            "checkpoint_data": {
-                                "pages_processed": page_count,
-                                "last_page_records": page_records,
-                                "service": "hubspot_deals",
-                            },
-                        }
-
-                        checkpoint_callback(job_id, checkpoint_data)
+                    # TODO: Handle pagination based on Hubspot_Deals API response
+                    if (
+                        data.get("paging")
+                        and data["paging"].get("next")
+                        and data["paging"]["next"].get("after")
+                    ):
+                        after = data["paging"]["next"]["after"]
+                    elif data.get("has_more"):
+                        after = data.get("next_cursor")
+                    elif data.get("next_page_token"):
+                        after = data.get("next_page_token")
+                    else:
+                        # Final checkpoint on completion
+                        if checkpoint_callback:
+                            try:
+                                final_checkpoint = {
+                                    "phase": "main_data_completed",
+                                    "records_processed": total_records,
+                                    "cursor": None,
+                                    "page_number": page_count,
+                                    "batch_size": 100,
+                                    "checkpoint_data": {
+                                        "completion_status": "success",
+                                        "total_pages": page_count,
+                                        "final_total": total_records,
+                                        "service": "hubspot_deals",
+                                    },
+                                }
+                                checkpoint_callback(job_id, final_checkpoint)
+                            except Exception as e:
+                                logger.warning(
+                                    "Failed to save final checkpoint",
+                                    extra={"job_id": job_id, "error": str(e)},
+                                )
 
-                        logger.debug(
-                            "Checkpoint saved",
+                        logger.info(
+                            "Data extraction completed",
                             extra={
                                 "operation": "data_extraction",
                                 "job_id": job_id,
-                                "page_number": page_count,
                                 "total_records": total_records,
+                                "total_pages": page_count,
                             },
                         )
+                        break
 
-                    except Exception as checkpoint_error:
-                        logger.warning(
-                            "Failed to save checkpoint",
-                            extra={
-                                "operation": "data_extraction",
-                                "job_id": job_id,
-                                "error": str(checkpoint_error),
-                            },
-                        )
+                except Exception as e:
+                    logger.error(
+                        "Error fetching data page",
+                        extra={
+                            "operation": "data_extraction",
+                            "job_id": job_id,
+                            "page_number": page_count + 1,
+                            "error": str(e),
+                        },
+                        exc_info=True,
+                    )
 
-                # TODO: Handle pagination based on Hubspot_Deals API response
-                if (
-                    data.get("paging")
-                    and data["paging"].get("next")
-                    and data["paging"]["next"].get("after")
-                ):
-                    after = data["paging"]["next"]["after"]
-                elif data.get("has_more"):
-                    after = data.get("next_cursor")
-                elif data.get("next_page_token"):
-                    after = data.get("next_page_token")
-                else:
-                    # Final checkpoint on completion
+                    # Save error checkpoint for debugging
                     if checkpoint_callback:
                         try:
-                            final_checkpoint = {
-                                "phase": "main_data_completed",
+                            error_checkpoint = {
+                                "phase": "main_data_error",
                                 "records_processed": total_records,
-                                "cursor": None,
+                                "cursor": after,
                                 "page_number": page_count,
                                 "batch_size": 100,
                                 "checkpoint_data": {
-                                    "completion_status": "success",
-                                    "total_pages": page_count,
-                                    "final_total": total_records,
+                                    "error": str(e),
+                                    "error_page": page_count + 1,
+                                    "recovery_cursor": after,
                                     "service": "hubspot_deals",
                                 },
                             }
-                            checkpoint_callback(job_id, final_checkpoint)
-                        except Exception as e:
-                            logger.warning(
-                                "Failed to save final checkpoint",
-                                extra={"job_id": job_id, "error": str(e)},
-                            )
-
-                    logger.info(
-                        "Data extraction completed",
-                        extra={
-                            "operation": "data_extraction",
-                            "job_id": job_id,
-                            "total_records": total_records,
-                            "total_pages": page_count,
-                        },
-                    )
-                    break
-
-            except Exception as e:
-                logger.error(
-                    "Error fetching data page",
-                    extra={
-                        "operation": "data_extraction",
-                        "job_id": job_id,
-                        "page_number": page_count + 1,
-                        "error": str(e),
-                    },
-                    exc_info=True,
-                )
-
-                # Save error checkpoint for debugging
-                if checkpoint_callback:
-                    try:
-                        error_checkpoint = {
-                            "phase": "main_data_error",
-                            "records_processed": total_records,
-                            "cursor": after,
-                            "page_number": page_count,
-                            "batch_size": 100,
-                            "checkpoint_data": {
-                                "error": str(e),
-                                "error_page": page_count + 1,
-                                "recovery_cursor": after,
-                                "service": "hubspot_deals",
-                            },
-                        }
-                        checkpoint_callback(job_id, error_checkpoint)
-                    except:
-                        pass
-
-                raise e
+                            checkpoint_callback(job_id, error_checkpoint)
+                        except:
+                            pass
+
+                    raise e
+        finally:
+            # Also runs when dlt closes the generator early; an in-flight request
+            # is left to finish in the background rather than blocking here
+            prefetch_executor.shutdown(wait=False, cancel_futures=True)
 
     return [get_main_data]
\ No newline at end of file
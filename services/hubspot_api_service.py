@@ -3,8 +3,10 @@
 Features:
 - Authentication using HubSpot access (OAuth/Private App) tokens
 - get_deals() with cursor-based pagination and the requested signature
-- Sliding-window rate limiter (150 req / 10 seconds, process-local)
-- Robust retries with exponential backoff and 429 Retry-After honoring
+- iter_deal_pages() that fetches the next page while the caller consumes the current one
+- Token-bucket rate limiter (150 req / 10 seconds), process-local or shared via Redis
+- Robust retries with decorrelated-jitter backoff and 429 Retry-After honoring
+- Circuit breaker that fails fast during sustained 5xx/network failures
 - Error handling for common HubSpot API responses
 - Credential validation helper
 - Structured logging
@@ -24,19 +26,28 @@ Example:
     print(len(data.get("results", [])))
 
 Notes:
-- If you run many processes, consider a distributed rate limiter instead of the
-  in-process sliding window implemented here.
+- If you run many processes, pass redis_url=... so all of them draw from one
+  Redis-backed token bucket instead of each using its own in-process budget
+  (requires the optional `redis` package).
+- Requests use pooled HTTP/1.1 keep-alive connections from a requests.Session;
+  see iter_deal_pages() for why paging never has more than one request in flight.
 """
 from __future__ import annotations
 
+import email.utils
+import hashlib
 import logging
+import random
 import time
-from collections import deque
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, NoReturn, Optional, Protocol, Tuple
 
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
 
 # ----------------------------- Logging ---------------------------------- #
 LOGGER = logging.getLogger(__name__)
@@ -86,6 +97,20 @@ class ServerError(HubSpotAPIError):
     pass
 
 
+# Upper bound on how long a single Retry-After header may make _request sleep
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+# Bytes of an error response body read when extracting its message
+_ERROR_BODY_LIMIT = 4096
+
+# Non-retryable statuses with a dedicated exception type
+_STATUS_ERRORS: Dict[int, type[HubSpotAPIError]] = {
+    401: UnauthorizedError,
+    403: ForbiddenError,
+    404: NotFoundError,
+}
+
+
 # ----------------------------- Rate Limiter ------------------------------ #
 @dataclass
 class RateLimitConfig:
@@ -93,23 +118,129 @@ class RateLimitConfig:
     window_seconds: float = 10.0
 
 
+class RateLimiter(Protocol):
+    """Anything with a blocking acquire() that returns once a request may be sent."""
+
+    def acquire(self) -> None: ...
+
+
+def _token_bucket_params(config: RateLimitConfig) -> Tuple[float, float]:
+    """Return (capacity, refill rate per second) for a token bucket enforcing `config`."""
+    capacity = max(1.0, config.max_requests * 0.1)
+    # A one-request budget has nothing left to refill; refill that single token once per window
+    refill = config.max_requests - capacity or float(config.max_requests)
+    return capacity, refill / config.window_seconds
+
+
 class SlidingWindowRateLimiter:
-    """Simple process-local sliding window limiter."""
+    """Simple process-local sliding window limiter.
+
+    Hit timestamps live in a preallocated array('d') ring buffer; only the
+    oldest of the last `max_requests` hits matters once the ring is full.
+    """
 
     def __init__(self, config: RateLimitConfig):
         self.config = config
-        self._hits: deque[float] = deque()
+        self._capacity = config.max_requests
+        self._ring = array("d", [0.0] * self._capacity)
+        self._head = 0  # index of the oldest recorded hit
+        self._count = 0
 
     def acquire(self) -> None:
         now = time.monotonic()
-        window_start = now - self.config.window_seconds
-        while self._hits and self._hits[0] < window_start:
-            self._hits.popleft()
-        if len(self._hits) >= self.config.max_requests:
-            sleep_for = self._hits[0] + self.config.window_seconds - now
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-        self._hits.append(time.monotonic())
+        if self._count < self._capacity:
+            self._ring[(self._head + self._count) % self._capacity] = now
+            self._count += 1
+            return
+
+        oldest = self._ring[self._head]
+        sleep_for = oldest + self.config.window_seconds - now
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+            now = time.monotonic()
+        # The ring is full: overwrite the oldest hit and advance the head
+        self._ring[self._head] = now
+        self._head = (self._head + 1) % self._capacity
+
+
+class TokenBucketRateLimiter:
+    """Process-local token bucket with a constant-time acquire.
+
+    A small burst (10% of the per-window budget, at least one request) is
+    available up front and the rest refills over the window, so no
+    window_seconds span can see more than max_requests calls
+    (capacity + rate * window_seconds == max_requests).
+    """
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self.capacity, self.rate = _token_bucket_params(config)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+
+    def acquire(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        self.tokens -= 1
+        if self.tokens < 0:
+            # The deficit is refilled while we sleep; refill accounting resumes from `now`
+            time.sleep(-self.tokens / self.rate)
+
+
+class RedisTokenBucketLimiter:
+    """Token bucket stored in Redis so every process shares one request budget.
+
+    Refill and consumption run atomically in a Lua script using the Redis server
+    clock, so workers on different hosts agree on the bucket state.
+    """
+
+    _SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local last = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - last) * rate)
+local wait_ms = 0
+if tokens < 1 then
+    wait_ms = math.ceil((1 - tokens) / rate * 1000)
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], ttl)
+return wait_ms
+"""
+
+    def __init__(self, config: RateLimitConfig, redis_url: str, key: str):
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError("redis_url requires the 'redis' package to be installed") from exc
+
+        self.config = config
+        self.key = key
+        self._client = redis.Redis.from_url(redis_url)
+        self._acquire_script = self._client.register_script(self._SCRIPT)
+        # Same burst/refill split as TokenBucketRateLimiter so a window stays within max_requests
+        capacity, rate = _token_bucket_params(config)
+        self._args = [
+            capacity,
+            rate,
+            int(config.window_seconds * 2000),  # keep idle buckets for two windows
+        ]
+
+    def acquire(self) -> None:
+        while True:
+            wait_ms = int(self._acquire_script(keys=[self.key], args=self._args))
+            if wait_ms <= 0:
+                return
+            time.sleep(wait_ms / 1000.0)
 
 
 # ----------------------------- Service ---------------------------------- #
@@ -130,32 +261,67 @@ class HubSpotAPIService:
         default_max_pages: int = 50,
         session: Optional[requests.Session] = None,
         logger: Optional[logging.Logger] = None,
+        redis_url: Optional[str] = None,
+        rate_limit_key: Optional[str] = None,
+        breaker_threshold: int = 10,
+        breaker_cooldown: float = 30.0,
     ) -> None:
         # if not access_token:
         #     raise ValueError("access_token must be provided")
-        self.access_token = access_token
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_initial = backoff_initial
         self.backoff_max = backoff_max
+        self._last_backoff = backoff_initial
+        # Circuit breaker: after `breaker_threshold` consecutive 5xx/network failures,
+        # fail fast for `breaker_cooldown` seconds before letting a trial request through
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._breaker = {"fails": 0, "opened_at": 0.0}
         self.default_max_pages = default_max_pages
-        self.session = session or requests.Session()
         self.logger = logger or LOGGER
         self.user_agent = user_agent
-        self.rate_limiter = SlidingWindowRateLimiter(
-            RateLimitConfig(max_requests=int(rate_limit[0]), window_seconds=float(rate_limit[1]))
-        )
-
-    # ------------------------- Internal helpers ------------------------- #
-    def _headers(self, override_token: Optional[str] = None) -> Dict[str, str]:
-        token = override_token or self.access_token
-        return {
-            "Authorization": f"Bearer {token}",
+        if session is None:
+            # Keep a larger pool of persistent connections so repeated calls
+            # reuse sockets instead of re-doing the TLS handshake
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=1, pool_maxsize=64, pool_block=False, max_retries=0),
+            )
+        self.session = session
+        rate_config = RateLimitConfig(max_requests=int(rate_limit[0]), window_seconds=float(rate_limit[1]))
+        self.rate_limiter: RateLimiter
+        if redis_url:
+            # HubSpot limits each app/portal separately, so the shared bucket is keyed
+            # per token unless the caller supplies an explicit key (e.g. the portal id).
+            # The key is fixed here; set_token() does not move the service to another bucket.
+            if not rate_limit_key:
+                if not access_token:
+                    # Every token-less service would otherwise share one global bucket
+                    raise ValueError("rate_limit_key is required with redis_url when no access_token is given")
+                digest = hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
+                rate_limit_key = f"hubspot_api_service:rate_limit:{digest}"
+            self.rate_limiter = RedisTokenBucketLimiter(rate_config, redis_url, key=rate_limit_key)
+        else:
+            self.rate_limiter = TokenBucketRateLimiter(rate_config)
+        # Per-request headers are immutable for a given token, so build them once;
+        # set_token() fills in Authorization and rebuilds them on token changes
+        self._default_headers: Dict[str, str] = {
             "Content-Type": "application/json",
             "Accept": "application/json",
             "User-Agent": self.user_agent,
+            "Connection": "keep-alive",
         }
+        self.set_token(access_token)
+
+    # ------------------------- Internal helpers ------------------------- #
+    def _headers(self, override_token: Optional[str] = None) -> Dict[str, str]:
+        # The shared dict is returned as-is; callers must not mutate it
+        if not override_token:
+            return self._default_headers
+        return {**self._default_headers, "Authorization": f"Bearer {override_token}"}
 
     def _request(
         self,
@@ -167,21 +333,33 @@ class HubSpotAPIService:
         access_token: Optional[str] = None,
     ) -> requests.Response:
         """Low-level HTTP with retries, backoff, and error handling.
-        Returns the raw Response; caller can parse .json().
+        Returns the Response with its body already read; caller can parse .content.
         """
         # Compose full URL
-        if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+        if path_or_url.startswith(("http://", "https://")):
             url = path_or_url
         else:
             url = f"{self.base_url}{path_or_url}"
 
+        logger = self.logger
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
         attempt = 0
+        honor_retry_after = False
         while True:
             attempt += 1
-            self.rate_limiter.acquire()
+            self._raise_if_circuit_open()
 
+            # After sleeping out the server's Retry-After the slot is already paid for
+            if honor_retry_after:
+                honor_retry_after = False
+            else:
+                self.rate_limiter.acquire()
+
+            resp = None
             try:
-                self.logger.debug("HTTP %s %s | params=%s json=%s", method, url, params, json)
+                if debug_enabled:
+                    logger.debug("HTTP %s %s | params=%s json=%s", method, url, params, json)
                 resp = self.session.request(
                     method=method.upper(),
                     url=url,
@@ -189,49 +367,81 @@ class HubSpotAPIService:
                     params=params,
                     json=json,
                     timeout=self.timeout,
+                    # Bodies are read lazily so error responses can be capped
+                    stream=True,
                 )
+                status = resp.status_code
+                if 200 <= status < 300:
+                    # Download success bodies here so a broken read is retried like any network error
+                    _ = resp.content
             except requests.RequestException as exc:
-                self.logger.warning("Request error on attempt %s: %s", attempt, exc)
+                if resp is not None:
+                    resp.close()
+                logger.warning("Request error on attempt %s: %s", attempt, exc)
+                self._record_failure()
+                self._raise_if_circuit_open()
                 if attempt > self.max_retries:
                     raise HubSpotAPIError(f"Network error after {self.max_retries} retries: {exc}")
                 self._sleep_with_backoff(attempt)
                 continue
 
             # Success
-            if 200 <= resp.status_code < 300:
+            if 200 <= status < 300:
+                self._last_backoff = self.backoff_initial
+                self._breaker["fails"] = 0
                 return resp
 
             request_id = resp.headers.get("X-Request-ID")
 
             # Specific error handling
-            if resp.status_code == 401:
-                self._raise_with_payload(UnauthorizedError, resp, request_id)
-            elif resp.status_code == 403:
-                self._raise_with_payload(ForbiddenError, resp, request_id)
-            elif resp.status_code == 404:
-                self._raise_with_payload(NotFoundError, resp, request_id)
-            elif resp.status_code == 429:
+            if status == 429:
                 retry_after = self._parse_retry_after(resp)
-                self.logger.warning("Rate limited (429). Retry-After=%.2fs; attempt=%d", retry_after or -1, attempt)
+                logger.warning("Rate limited (429). Retry-After=%.2fs; attempt=%d", retry_after or -1, attempt)
                 if attempt > self.max_retries:
                     self._raise_with_payload(RateLimitError, resp, request_id, retry_after=retry_after)
+                self._release(resp)
                 if retry_after and retry_after > 0:
                     time.sleep(retry_after)
+                    honor_retry_after = True
                 else:
                     self._sleep_with_backoff(attempt)
                 continue
-            elif 500 <= resp.status_code < 600:
-                self.logger.warning("Server error %d on attempt %d", resp.status_code, attempt)
+            elif 500 <= status < 600:
+                logger.warning("Server error %d on attempt %d", status, attempt)
+                self._record_failure()
                 if attempt > self.max_retries:
                     self._raise_with_payload(ServerError, resp, request_id)
+                self._release(resp)
+                self._raise_if_circuit_open()
                 self._sleep_with_backoff(attempt)
                 continue
             else:
-                self._raise_with_payload(HubSpotAPIError, resp, request_id)
+                self._raise_with_payload(_STATUS_ERRORS.get(status, HubSpotAPIError), resp, request_id)
+
+    def _raise_if_circuit_open(self) -> None:
+        breaker = self._breaker
+        if (
+            breaker["fails"] >= self.breaker_threshold
+            and time.monotonic() - breaker["opened_at"] < self.breaker_cooldown
+        ):
+            raise ServerError(
+                f"Circuit open after {breaker['fails']} consecutive failures; "
+                f"failing fast for up to {self.breaker_cooldown:g}s"
+            )
+
+    def _record_failure(self) -> None:
+        breaker = self._breaker
+        breaker["fails"] += 1
+        if breaker["fails"] >= self.breaker_threshold:
+            # (Re-)open the circuit; a failed half-open trial restarts the cooldown
+            breaker["opened_at"] = time.monotonic()
+            self.logger.warning("Circuit opened after %d consecutive failures", breaker["fails"])
 
     def _sleep_with_backoff(self, attempt: int) -> None:
-        delay = min(self.backoff_max, self.backoff_initial * (2 ** (attempt - 1)))
-        time.sleep(delay + (0.05 * (attempt % 3)))  # small jitter to avoid thundering herd
+        # Decorrelated jitter: randomised delays keep concurrent workers from retrying in lockstep
+        delay = min(self.backoff_max, random.uniform(self.backoff_initial, self._last_backoff * 3))
+        self._last_backoff = delay
+        time.sleep(delay)
 
     @staticmethod
     def _parse_retry_after(resp: requests.Response) -> Optional[float]:
@@ -239,9 +449,36 @@ class HubSpotAPIService:
         if not val:
             return None
         try:
-            return float(val)
+            # delta-seconds form, e.g. "Retry-After: 2"
+            delay = float(val)
         except ValueError:
-            return None
+            try:
+                # HTTP-date form, e.g. "Retry-After: Wed, 21 Oct 2015 07:28:00 GMT"
+                retry_at = email.utils.parsedate_to_datetime(val)
+                if retry_at.tzinfo is None:
+                    retry_at = retry_at.replace(tzinfo=timezone.utc)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        # Bound the wait so a bogus header or a skewed gateway clock cannot stall the worker
+        return min(max(0.0, delay), MAX_RETRY_AFTER_SECONDS)
+
+    @staticmethod
+    def _release(resp: requests.Response) -> None:
+        """Finish with a streamed response, keeping its connection reusable when cheap."""
+        # urllib3 only returns a connection to the pool once its body has been read in
+        # full; closing an unread response drops the socket. Drain small bodies, and
+        # discard the connection only for large or unsized ones.
+        try:
+            length = int(resp.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if 0 <= length <= _ERROR_BODY_LIMIT:
+            try:
+                _ = resp.content
+            except requests.RequestException:
+                pass
+        resp.close()
 
     def _raise_with_payload(
         self,
@@ -249,25 +486,71 @@ class HubSpotAPIService:
         resp: requests.Response,
         request_id: Optional[str],
         **kwargs: Any,
-    ) -> None:
+    ) -> NoReturn:
+        # Only the message is needed, so never pull more than a few KB of an error body
         try:
-            payload = resp.json()
-            message = payload.get("message") or payload.get("error") or resp.text
-        except ValueError:
-            message = resp.text
+            body = resp.raw.read(_ERROR_BODY_LIMIT, decode_content=True) or b""
+        except Exception:
+            body = b""
+        finally:
+            resp.close()
+
+        text = body[:512].decode("utf-8", "replace")
+        try:
+            payload = orjson.loads(body) if body else {}
+            message = payload.get("message") or payload.get("error") or text
+        except (orjson.JSONDecodeError, ValueError, AttributeError):
+            message = text
         raise exc_type(message=message, status=resp.status_code, request_id=request_id, **kwargs)
 
+    def _probe(self) -> bool:
+        """Single request for a minimal page of deals, bypassing the limiter and retries.
+
+        Returns True on 200 and False on 401; any other status raises.
+        """
+        try:
+            resp = self.session.get(
+                f"{self.base_url}/crm/v3/objects/deals",
+                headers=self._default_headers,
+                params={"limit": 1},
+                timeout=5.0,
+                stream=True,
+            )
+        except requests.RequestException as exc:
+            raise HubSpotAPIError(f"Network error during credential check: {exc}")
+
+        if resp.status_code in (200, 401):
+            self._release(resp)
+            return resp.status_code == 200
+        request_id = resp.headers.get("X-Request-ID")
+        if resp.status_code == 429:
+            self._raise_with_payload(
+                RateLimitError, resp, request_id, retry_after=self._parse_retry_after(resp)
+            )
+        self._raise_with_payload(_STATUS_ERRORS.get(resp.status_code, HubSpotAPIError), resp, request_id)
+
     # ------------------------- Public methods ---------------------------- #
+    def set_token(self, access_token: str) -> None:
+        """Replace the default access token (e.g. after an OAuth refresh)."""
+        # Swap in a new dict so a request already holding the old one is unaffected
+        self._default_headers = {**self._default_headers, "Authorization": f"Bearer {access_token}"}
+        self._access_token = access_token
+
+    @property
+    def access_token(self) -> str:
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value: str) -> None:
+        self.set_token(value)
+
     def validate_credentials(self) -> bool:
         """Lightweight token check by fetching a minimal page of deals."""
-        try:
-            resp = self._request("GET", "/crm/v3/objects/deals", params={"limit": 1})
-            _ = resp.json()  # ensure JSON parse works
+        if self._probe():
             self.logger.info("Credential validation: success")
             return True
-        except UnauthorizedError as e:
-            self.logger.error("Credential validation failed: %s", e)
-            return False
+        self.logger.error("Credential validation failed: unauthorized (HTTP 401)")
+        return False
 
     def get_deals(
         self,
@@ -289,10 +572,11 @@ class HubSpotAPIService:
             url: Relative path (e.g., "/crm/v3/objects/deals") or absolute URL.
 
         Returns:
-            dict with keys:
-              - results: List[dict] of aggregated deals
+            The HubSpot response for a single page:
+              - results: List[dict] of deals in this page
               - paging: {"next": {"after": str}} when more pages exist, else missing
-              - meta: {"pages_fetched": int, "page_size": int}
+
+            Use iter_deal_pages() to walk every page one at a time.
         """
         if not url:
             url = "/crm/v3/objects/deals"
@@ -303,52 +587,67 @@ class HubSpotAPIService:
         if limit > 100:
             limit = 100
 
-        results: List[Dict[str, Any]] = []
-        pages_fetched = 0
-        cursor = after
+        full_url = url if url.startswith(("http://", "https://")) else f"{self.base_url}{url}"
+        resp = self._request(
+            "GET",
+            full_url,
+            params={"limit": limit, "archived": "false", **({"after": after} if after else {})},
+            access_token=access_token,
+        )
+        payload = orjson.loads(resp.content) if resp.content else {}
 
-        params = {"limit": limit, "archived": "false"}
-        if cursor:
-            params["after"] = cursor
+        return payload
 
-        resp = self._request("GET", f"{self.base_url}{url}", params=params, access_token=access_token)
-        payload = resp.json() if resp.content else {}
+    def iter_deal_pages(
+        self,
+        *,
+        access_token: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[str] = None,
+        url: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield raw deal pages, following paging.next.after.
 
-        return payload
-        
-        '''
-        while pages_fetched < self.default_max_pages:
-            params = {"limit": limit, "archived": "false"}
-            if cursor:
-                params["after"] = cursor
-
-            resp = self._request("GET", url, params=params, access_token=access_token)
-            payload = resp.json() if resp.content else {}
-
-            page_results = payload.get("results", []) or []
-            results.extend(page_results)
-            pages_fetched += 1
-
-            # Move the cursor forward
-            paging = payload.get("paging") or {}
-            next_link = paging.get("next") or {}
-            cursor = next_link.get("after")
-
-            self.logger.info(
-                "Fetched page %d (%d items)", pages_fetched, len(page_results)
-            )
+        The request for the next page is issued on a background thread as soon
+        as its cursor is known, so it is in flight while the caller processes the
+        current page. Cursors are only returned by the previous response, which
+        means at most one request runs ahead of the consumer. HubSpot documents
+        `after` as an opaque token, so later cursors are never guessed.
 
-            if not cursor:
-                break
+        Args:
+            access_token: Optional token override for these calls only.
+            limit: Page size (clamped to 1-100 by get_deals()).
+            after: Cursor to start from.
+            url: Relative path or absolute URL, as for get_deals().
+            max_pages: Stop after this many pages (defaults to default_max_pages).
+        """
+        max_pages = max_pages or self.default_max_pages
 
-        out: Dict[str, Any] = {
-            "results": results,
-            "meta": {"pages_fetched": pages_fetched, "page_size": limit},
-        }
-        if cursor:
-            out["paging"] = {"next": {"after": cursor}}
-        return out
-        '''
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hubspot_prefetch")
+        try:
+            pending: Optional[Future[Dict[str, Any]]] = executor.submit(
+                self.get_deals, access_token=access_token, limit=limit, after=after, url=url
+            )
+            pages_fetched = 0
+            while pending is not None:
+                payload = pending.result()
+                pages_fetched += 1
+
+                cursor = ((payload.get("paging") or {}).get("next") or {}).get("after")
+                pending = None
+                if cursor and pages_fetched < max_pages:
+                    pending = executor.submit(
+                        self.get_deals, access_token=access_token, limit=limit, after=cursor, url=url
+                    )
+
+                self.logger.info(
+                    "Fetched page %d (%d items)", pages_fetched, len(payload.get("results") or [])
+                )
+                yield payload
+        finally:
+            # Don't wait on a prefetch the caller abandoned by closing the generator early
+            executor.shutdown(wait=False, cancel_futures=True)
 
     # Optional: compatibility adapter if some callers still use `get_data`
     def get_data(
@@ -399,4 +698,4 @@ if __name__ == "__main__":
     print()
     # print(data)
     print()
-    print(json.dumps(data, indent=4))
\ No newline at end of file
+    print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
\ No newline at end of file